@@ -1,5 +1,5 @@
-import os
-
-class Config:
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'phishscan-secret-key'
+import os
+
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY') or 'phishscan-secret-key'
     TEMPLATES_AUTO_RELOAD = True
\ No newline at end of file
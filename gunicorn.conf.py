@@ -0,0 +1,12 @@
+# Picked up automatically by `gunicorn wsgi:app` from the repo root.
+# The scan endpoints spend nearly all their time blocked on DNS/WHOIS/HTTP
+# waits, so thread workers are what let scans run concurrently instead of
+# serializing behind the process count; the CPU work per request is small.
+import multiprocessing
+
+worker_class = "gthread"
+workers = multiprocessing.cpu_count()
+threads = 8
+
+# analyze() can legitimately spend several seconds on slow WHOIS servers
+timeout = 60
@@ -1,678 +1,1033 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-phishing_detector.py
-
-Advanced heuristic phishing detector.
-Prompts for a website URL, fetches it, and reports:
-- Verdict (Phishing / Suspicious / Likely safe)
-- Overall risk score (0-100)
-- Detailed threats with severities and "sources" (e.g., form actions, external scripts)
-- Helpful context (WHOIS domain age, TLS certificate info, DNS/resolve status)
-
-This script auto-installs missing libraries (requests, bs4, tldextract, python-whois, idna).
-"""
-
-import sys
-import subprocess
-import importlib
-import json
-import re
-import socket
-import ssl
-import datetime as dt
-from datetime import timezone
-from urllib.parse import urlparse, urljoin
-
-# --- helper: ensure deps ---
-def _pip_install(pkg: str):
-    subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
-
-def _ensure_import(pkg: str, import_name=None):
-    try:
-        return importlib.import_module(import_name or pkg)
-    except ImportError:
-        print(f"[setup] Installing missing dependency: {pkg} ...")
-        _pip_install(pkg)
-        return importlib.import_module(import_name or pkg)
-
-requests = _ensure_import("requests")
-bs4 = _ensure_import("bs4")
-BeautifulSoup = bs4.BeautifulSoup
-
-tldextract = _ensure_import("tldextract")
-whois = _ensure_import("python-whois", "whois")
-idna = _ensure_import("idna")
-
-# --- constants ---
-USER_AGENT = "Mozilla/5.0 (compatible; PhishGuard/1.0; +https://localhost:5000)"
-HTTP_TIMEOUT = 12
-DNS_TIMEOUT = 6
-SSL_TIMEOUT = 8
-
-# More specific suspicious TLDs (avoid common ones)
-SUSPICIOUS_TLDS = set("""
-zip kim top work country stream biz men loan mom gq cf tk ml ga surf fit ltda cam bar click link xyz rest review date online cam app pics quest ryuk
-accountant bid cc club cricket date download faith ga ga gq gq link ltd men ml mom party press pw review science stream tk top win work xyz
-""".split())
-
-# LEGITIMATE TLDs that should never be flagged as suspicious
-LEGITIMATE_TLDS = set("""
-com org net edu gov mil io ai co uk us ca au nz de fr es it nl se no dk fi
-ie at ch be lu pt gr hu pl cz sk si hr ba rs me al mk mt cy li is ee lv lt
-""".split())
-
-# Trusted domains that should never be flagged (including subdomains)
-TRUSTED_DOMAINS = set("""
-google.com facebook.com apple.com microsoft.com amazon.com netflix.com
-twitter.com instagram.com linkedin.com github.com oracle.com whatsapp.com
-signal.org telegram.org discord.com slack.com dropbox.com box.com
-adobe.com salesforce.com ibm.com intel.com nvidia.com amd.com
-paypal.com stripe.com visa.com mastercard.com americanexpress.com
-wikipedia.org mozilla.org wordpress.org archive.org
-berkeley.edu stanford.edu mit.edu harvard.edu yale.edu princeton.edu
-columbia.edu upenn.edu cornell.edu brown.edu dartmouth.edu
-ucla.edu ucsd.edu ucb.edu umich.edu uiuc.edu utexas.edu
-""".split())
-
-# Trusted domain patterns (regex patterns for subdomains of trusted domains)
-TRUSTED_PATTERNS = [
-    r"^[a-zA-Z0-9-]+\.oracle\.com$",
-    r"^[a-zA-Z0-9-]+\.whatsapp\.com$",
-    r"^[a-zA-Z0-9-]+\.google\.com$",
-    r"^[a-zA-Z0-9-]+\.microsoft\.com$",
-    r"^[a-zA-Z0-9-]+\.apple\.com$",
-    r"^[a-zA-Z0-9-]+\.amazon\.com$",
-    r"^[a-zA-Z0-9-]+\.github\.com$",
-    r"^[a-zA-Z0-9-]+\.edu$",
-    r"^[a-zA-Z0-9-]+\.[a-zA-Z0-9-]+\.edu$",
-    r"^[a-zA-Z0-9-]+\.edu\.[a-zA-Z]{2,}$",  # edu.au, edu.uk, etc.
-    r"^[a-zA-Z0-9-]+\.ac\.[a-zA-Z]{2,}$",   # ac.uk, ac.jp, etc.
-    r"^[a-zA-Z0-9-]+\.gov$",
-    r"^[a-zA-Z0-9-]+\.gov\.[a-zA-Z]{2,}$",  # gov.au, gov.uk, etc.
-    r"^[a-zA-Z0-9-]+\.org$",
-    r"^[a-zA-Z0-9-]+\.mil$",
-]
-
-# Reduced list of suspicious keywords - focused on phishing-specific terms
-SUSPICIOUS_KEYWORDS = [
-    "login-secure", "verify-account", "update-details", "secure-account", "bank-login", 
-    "wallet-access", "pay-now", "password-reset", "support-ticket", "helpdesk-verify",
-    "unlock-account", "billing-update", "confirm-details", "re-activate-now", 
-    "gift-card", "free-offer", "prize-winner", "bonus-claim"
-]
-
-BRAND_HINTS = ["Apple", "Microsoft", "Google", "Facebook", "Instagram", "Amazon", "Netflix", "PayPal", "Adobe", "LinkedIn", "Bank"]
-
-OBFUSCATION_HINTS = [
-    r"\beval\s*\(", r"Function\s*\(", r"atob\s*\(", r"unescape\s*\(", r"fromCharCode\s*\(",
-    r"document\.write\s*\(", r"\.replace\s*\(/.*?/", r"obfuscate", r"packer", r"window\["
-]
-
-REDIRECT_HINTS = [
-    r"window\.location", r"location\.href", r"location\.replace", r"top\.location"
-]
-
-RIGHTCLICK_BLOCK_HINTS = [
-    r"contextmenu", r"document\.oncontextmenu", r"return\s+false;"
-]
-
-# Adjusted weights for risk scoring (0-100 total typical) - FIXED WEIGHTS
-WEIGHTS = {
-    "ip_in_url": 8,
-    "punycode": 5,
-    "unicode_homoglyphs": 5,
-    "too_many_subdomains": 2,
-    "suspicious_tld": 4,
-    "url_length": 2,
-    "at_symbol": 5,
-    "double_slash": 2,
-    "many_hyphens": 2,
-    "suspicious_keywords": 3,
-
-    "no_https": 0,  # Reduced from 15
-    "weak_tls": 0,
-    "cert_short_validity": 0,
-    "cert_expiring_soon": 0,
-
-    "dns_missing": 6,
-    "domain_too_new": 4,  # Reduced from 5
-
-    "external_favicon": 2,
-    "external_form_action": 8,
-    "mailto_exfil": 5,
-    "password_over_http": 10,
-    "many_external_scripts": 3,
-    "many_iframes": 2,
-    "obfuscation": 4,
-    "redirect_js": 2,
-    "rightclick_block": 2,
-    "brand_title_mismatch": 3,
-}
-
-def normalize_url(url: str) -> str:
-    url = url.strip()
-    if not re.match(r"^https?://", url, re.IGNORECASE):
-        url = "http://" + url
-    parsed = urlparse(url)
-    cleaned = parsed._replace(fragment="").geturl()
-    return cleaned
-
-def domain_parts(url: str):
-    ext = tldextract.extract(url)
-    domain = f"{ext.domain}.{ext.suffix}" if ext.suffix else ext.domain
-    subdomain = ext.subdomain
-    return domain.lower(), subdomain.lower() if subdomain else ""
-
-def is_trusted_domain(domain: str):
-    """Check if domain is in trusted list or matches trusted patterns"""
-    # Check exact match
-    if domain in TRUSTED_DOMAINS:
-        return True
-    
-    # Check if it's a subdomain of a trusted domain
-    for trusted_domain in TRUSTED_DOMAINS:
-        if domain.endswith('.' + trusted_domain):
-            return True
-    
-    # Check against patterns
-    for pattern in TRUSTED_PATTERNS:
-        if re.match(pattern, domain, re.IGNORECASE):
-            return True
-    
-    # Check for educational/academic domains
-    if domain.endswith('.edu') or '.edu.' in domain or '.ac.' in domain:
-        return True
-        
-    # Check for government domains
-    if domain.endswith('.gov') or '.gov.' in domain:
-        return True
-        
-    # Check for organizational domains
-    if domain.endswith('.org'):
-        return True
-    
-    return False
-
-def is_legitimate_tld(tld: str):
-    return tld in LEGITIMATE_TLDS
-
-def is_ip(host: str) -> bool:
-    try:
-        socket.inet_aton(host)
-        return True
-    except OSError:
-        pass
-    try:
-        socket.inet_pton(socket.AF_INET6, host)
-        return True
-    except OSError:
-        return False
-
-def contains_unicode_homoglyphs(host: str) -> bool:
-    return any(ord(c) > 127 for c in host)
-
-def get_dns_a(host: str):
-    try:
-        socket.setdefaulttimeout(DNS_TIMEOUT)
-        return socket.gethostbyname_ex(host)
-    except Exception:
-        return None
-
-def get_tls_cert(host: str, port: int = 443):
-    try:
-        context = ssl.create_default_context()
-        with socket.create_connection((host, port), timeout=SSL_TIMEOUT) as sock:
-            with context.wrap_socket(sock, server_hostname=host) as ssock:
-                cert = ssock.getpeercert()
-                return cert
-    except Exception:
-        return None
-
-def parse_cert_dates(cert):
-    def _parse(s):
-        try:
-            return dt.datetime.strptime(s, "%b %d %H:%M:%S %Y %Z").replace(tzinfo=timezone.utc)
-        except Exception:
-            return None
-    not_before = _parse(cert.get("notBefore", "")) if cert else None
-    not_after = _parse(cert.get("notAfter", "")) if cert else None
-    return not_before, not_after
-
-def _flatten_cert_name(name_obj):
-    """
-    ssl.getpeercert()['subject'] / ['issuer'] look like:
-      ((('commonName','example.com'),), (('organizationName',"Let's Encrypt"),), ...)
-    Convert robustly to a flat dict.
-    """
-    out = {}
-    if not name_obj:
-        return out
-    try:
-        for rdn in name_obj:           # rdn is a tuple of one or more (key, value)
-            for kv in rdn:
-                if isinstance(kv, (list, tuple)) and len(kv) == 2:
-                    k, v = kv
-                    out[str(k)] = str(v)
-                else:
-                    # Sometimes libraries return weird shapes; best-effort stringify
-                    try:
-                        k, v = map(str, kv)
-                        out[k] = v
-                    except Exception:
-                        pass
-    except Exception:
-        # Fallback: best-effort string
-        try:
-            return {"raw": str(name_obj)}
-        except Exception:
-            return {}
-    return out
-
-def get_whois(domain: str):
-    try:
-        data = whois.whois(domain)
-        return data
-    except Exception:
-        return None
-
-def domain_age_days(w):
-    def _to_dt(x):
-        if isinstance(x, list):
-            x = x[0]
-        if isinstance(x, dt.datetime):
-            return x
-        try:
-            return dt.datetime.fromisoformat(str(x))
-        except Exception:
-            return None
-    if not w:
-        return None
-    created = _to_dt(getattr(w, "creation_date", None))
-    if not created:
-        return None
-    if not created.tzinfo:
-        created = created.replace(tzinfo=timezone.utc)
-    now = dt.datetime.now(timezone.utc)
-    return max(0, (now - created).days)
-
-def fetch(url: str):
-    headers = {"User-Agent": USER_AGENT, "Accept": "*/*"}
-    try:
-        resp = requests.get(url, headers=headers, timeout=HTTP_TIMEOUT, allow_redirects=True)
-        return resp
-    except Exception:
-        return None
-
-def try_https_upgrade(url: str):
-    parsed = urlparse(url)
-    if parsed.scheme == "http":
-        return url.replace("http://", "https://", 1)
-    return url
-
-def _rel_contains_icon(rel_val):
-    if rel_val is None:
-        return False
-    if isinstance(rel_val, (list, tuple)):
-        s = " ".join(map(str, rel_val))
-    else:
-        s = str(rel_val)
-    return "icon" in s.lower()
-
-def collect_external_domains(soup: BeautifulSoup, base_domain: str):
-    externals = set()
-    for s in soup.find_all("script", src=True):
-        d, _ = domain_parts(s['src'])
-        if d and d != base_domain:
-            externals.add(d)
-    for i in soup.find_all("iframe", src=True):
-        d, _ = domain_parts(i['src'])
-        if d and d != base_domain:
-            externals.add(d)
-    for l in soup.find_all("link", href=True):
-        d, _ = domain_parts(l['href'])
-        if d and d != base_domain:
-            externals.add(d)
-    return externals
-
-def looks_like_brand_mismatch(title: str, domain: str):
-    title = (title or "").strip()
-    if not title:
-        return False
-    title_brands = [b for b in BRAND_HINTS if b.lower() in title.lower()]
-    if not title_brands:
-        return False
-    for b in title_brands:
-        if b.lower() in domain.lower():
-            return False
-    return True
-
-def analyze(url: str):
-    findings = []
-    score = 0
-    normalized = normalize_url(url)
-    parsed = urlparse(normalized)
-    host = parsed.hostname or ""
-    domain, subdomain = domain_parts(normalized)
-    
-    # Check if this is a trusted domain - if so, return safe immediately
-    if is_trusted_domain(domain):
-        return {
-            "input_url": url,
-            "normalized_url": normalized,
-            "host": host,
-            "domain": domain,
-            "tld": domain.split('.')[-1],
-            "verdict": "Likely safe",
-            "risk_score": 0,
-            "threats": [],
-            "context": {
-                "dns_resolve": True,
-                "domain_age_days": None,
-                "uses_https": parsed.scheme.lower() == "https",
-                "trusted_domain": True
-            },
-            "sources": {}
-        }
-
-    # --- URL-based checks ---
-    if is_ip(host):
-        findings.append(("MEDIUM", "IP address used in URL (often used to hide identity).", {"host": host}))
-        score += WEIGHTS["ip_in_url"]
-
-    if host.startswith("xn--") or ".xn--" in host:
-        findings.append(("LOW", "Punycode (IDN) in hostname; potential homograph attack.", {"host": host}))
-        score += WEIGHTS["punycode"]
-
-    if contains_unicode_homoglyphs(host):
-        findings.append(("LOW", "Non-ASCII characters in hostname; possible IDN homograph attempt.", {"host": host}))
-        score += WEIGHTS["unicode_homoglyphs"]
-
-    sub_count = len([p for p in host.split(".") if p]) - 2 if domain in host else host.count(".")
-    if sub_count >= 6:  # Increased threshold from 5 to 6
-        findings.append(("LOW", f"Many subdomains ({sub_count}).", {"host": host}))
-        score += WEIGHTS["too_many_subdomains"]
-
-    ext = tldextract.extract(normalized)
-    tld = (ext.suffix or "").split(".")[-1].lower()
-    
-    # Only flag TLD if it's suspicious AND not legitimate
-    if tld in SUSPICIOUS_TLDS and not is_legitimate_tld(tld):
-        findings.append(("LOW", f"Suspicious TLD: .{tld}", {"tld": tld}))
-        score += WEIGHTS["suspicious_tld"]
-
-    if len(normalized) > 180:  # Increased threshold from 150 to 180
-        findings.append(("LOW", f"Long URL ({len(normalized)} chars).", {"url": normalized[:100] + "..."}))
-        score += WEIGHTS["url_length"]
-
-    if "@" in normalized:
-        findings.append(("MEDIUM", "Contains '@' in URL (userinfo part).", {}))
-        score += WEIGHTS["at_symbol"]
-
-    if "//" in normalized.split("://", 1)[1]:
-        findings.append(("LOW", "Double slash in path (can be used for obfuscation).", {}))
-        score += WEIGHTS["double_slash"]
-
-    if host.count("-") >= 4:  # Increased threshold from 3 to 4
-        findings.append(("LOW", "Many hyphens in hostname.", {"host": host}))
-        score += WEIGHTS["many_hyphens"]
-
-    for kw in SUSPICIOUS_KEYWORDS:
-        if kw in normalized.lower():
-            findings.append(("LOW", f"Suspicious keyword in URL: '{kw}'.", {"keyword": kw}))
-            score += WEIGHTS["suspicious_keywords"]
-            break
-
-    # --- DNS & TLS ---
-    dns = get_dns_a(host)
-    if not dns:
-        findings.append(("HIGH", "DNS resolution failed (domain may not exist).", {}))
-        score += WEIGHTS["dns_missing"]
-    else:
-        # Check for brand mismatch in resolved hostnames
-        resolved_hosts = dns[2]
-        for resolved_host in resolved_hosts:
-            if is_ip(resolved_host):
-                continue
-            resolved_domain, _ = domain_parts(resolved_host)
-            if resolved_domain != domain:
-                findings.append(("MEDIUM", f"Resolved host '{resolved_host}' doesn't match domain '{domain}'.", {}))
-                score += 3  # Small penalty for mismatch
-
-    cert = get_tls_cert(host)
-    uses_https = parsed.scheme.lower() == "https"
-    if not uses_https:
-        findings.append(("HIGH", "No HTTPS (plain HTTP).", {}))
-        score += WEIGHTS["no_https"]
-    else:
-        if not cert:
-            findings.append(("HIGH", "HTTPS certificate invalid or untrusted.", {}))
-            score += WEIGHTS["weak_tls"]
-        else:
-            not_before, not_after = parse_cert_dates(cert)
-            if not_before and not_after:
-                now = dt.datetime.now(timezone.utc)
-                total_days = (not_after - not_before).days
-                if total_days < 30:
-                    findings.append(("LOW", f"Certificate has short validity ({total_days} days).", {}))
-                    score += WEIGHTS["cert_short_validity"]
-                if (not_after - now).days < 7:
-                    findings.append(("MEDIUM", "Certificate expiring soon.", {}))
-                    score += WEIGHTS["cert_expiring_soon"]
-
-    # --- WHOIS ---
-    whois_data = get_whois(domain)
-    age_days = domain_age_days(whois_data)
-    if age_days is not None and age_days < 30:  # Increased threshold from 15 to 30 days
-        findings.append(("MEDIUM", f"Domain is new ({age_days} days old).", {"age_days": age_days}))
-        score += WEIGHTS["domain_too_new"]
-
-    # --- HTML content analysis ---
-    resp = fetch(normalized)
-    if not resp:
-        # If HTTP fails, try HTTPS upgrade
-        https_url = try_https_upgrade(normalized)
-        if https_url != normalized:
-            resp = fetch(https_url)
-            if resp:
-                normalized = https_url
-                parsed = urlparse(normalized)
-                uses_https = True
-
-    sources = {
-        "external_domains": [],
-        "form_actions": [],
-        "mailto_links": [],
-        "obfuscated_scripts": [],
-        "redirect_scripts": [],
-        "rightclick_block": False,
-        "title": None,
-        "favicon_external": False
-    }
-
-    if resp and resp.status_code == 200:
-        try:
-            soup = BeautifulSoup(resp.text, "html.parser")
-        except Exception:
-            soup = None
-
-        if soup:
-            sources["title"] = soup.title.string if soup.title else None
-
-            # Check for brand mismatch in title
-            if sources["title"] and looks_like_brand_mismatch(sources["title"], domain):
-                findings.append(("MEDIUM", "Title contains brand name not matching domain.", {"title": sources["title"]}))
-                score += WEIGHTS["brand_title_mismatch"]
-
-            # Favicon
-            favicon = soup.find("link", rel=_rel_contains_icon)
-            if favicon and favicon.get("href"):
-                favicon_domain, _ = domain_parts(favicon["href"])
-                if favicon_domain and favicon_domain != domain:
-                    findings.append(("LOW", "Favicon loaded from external domain.", {"external_domain": favicon_domain}))
-                    score += WEIGHTS["external_favicon"]
-                    sources["favicon_external"] = True
-
-            # Forms
-            for form in soup.find_all("form", action=True):
-                action = form["action"]
-                action_domain, _ = domain_parts(action)
-                if action_domain and action_domain != domain:
-                    findings.append(("HIGH", f"Form submits to external domain: {action_domain}", {"action": action}))
-                    score += WEIGHTS["external_form_action"]
-                    sources["form_actions"].append(action)
-
-            # Mailto links for potential exfiltration
-            for link in soup.find_all("a", href=True):
-                href = link["href"]
-                if href.startswith("mailto:") and "?" in href:
-                    findings.append(("MEDIUM", "Mailto link with parameters (potential data exfiltration).", {"href": href}))
-                    score += WEIGHTS["mailto_exfil"]
-                    sources["mailto_links"].append(href)
-
-            # Password fields over HTTP
-            if not uses_https:
-                password_fields = soup.find_all("input", type="password")
-                if password_fields:
-                    findings.append(("HIGH", "Password field(s) found on HTTP page.", {"count": len(password_fields)}))
-                    score += WEIGHTS["password_over_http"]
-
-            # External scripts and iframes
-            externals = collect_external_domains(soup, domain)
-            sources["external_domains"] = list(externals)
-            if len(externals) > 8:  # Increased threshold from 5 to 8
-                findings.append(("LOW", f"Many external domains loaded ({len(externals)}).", {"domains": list(externals)}))
-                score += WEIGHTS["many_external_scripts"]
-
-            iframes = soup.find_all("iframe")
-            if len(iframes) > 5:  # Increased threshold from 3 to 5
-                findings.append(("LOW", f"Many iframes ({len(iframes)}).", {}))
-                score += WEIGHTS["many_iframes"]
-
-            # Script content analysis
-            for script in soup.find_all("script"):
-                content = script.string
-                if not content:
-                    continue
-                content = content.strip()
-                if not content:
-                    continue
-
-                # Obfuscation
-                for hint in OBFUSCATION_HINTS:
-                    if re.search(hint, content, re.IGNORECASE):
-                        findings.append(("MEDIUM", "Script contains obfuscation patterns.", {}))
-                        score += WEIGHTS["obfuscation"]
-                        sources["obfuscated_scripts"].append(content[:100] + "..." if len(content) > 100 else content)
-                        break
-
-                # Redirects
-                for hint in REDIRECT_HINTS:
-                    if re.search(hint, content, re.IGNORECASE):
-                        findings.append(("LOW", "Script contains redirect logic.", {}))
-                        score += WEIGHTS["redirect_js"]
-                        sources["redirect_scripts"].append(content[:100] + "..." if len(content) > 100 else content)
-                        break
-
-                # Right-click block
-                for hint in RIGHTCLICK_BLOCK_HINTS:
-                    if re.search(hint, content, re.IGNORECASE):
-                        findings.append(("LOW", "Script blocks right-click (common in phishing).", {}))
-                        score += WEIGHTS["rightclick_block"]
-                        sources["rightclick_block"] = True
-                        break
-
-    # --- Final scoring and verdict ---
-    # Adjusted thresholds to reduce false positives
-    if score >= 35:  # Increased from 25 to 35
-        verdict = "Phishing"
-    elif score >= 20:  # Increased from 15 to 20
-        verdict = "Suspicious"
-    else:
-        verdict = "Likely safe"
-
-    context = {
-        "dns_resolve": bool(dns),
-        "domain_age_days": age_days,
-        "uses_https": uses_https,
-        "trusted_domain": False
-    }
-
-    return {
-        "input_url": url,
-        "normalized_url": normalized,
-        "host": host,
-        "domain": domain,
-        "tld": tld,
-        "verdict": verdict,
-        "risk_score": score,
-        "threats": findings,
-        "context": context,
-        "sources": sources
-    }
-
-def print_report(report):
-    print("\n" + "="*60)
-    print("PHISHING DETECTION REPORT")
-    print("="*60)
-    print(f"Input URL:    {report['input_url']}")
-    print(f"Normalized:   {report['normalized_url']}")
-    print(f"Domain:       {report['domain']}")
-    print(f"TLD:          {report['tld']}")
-    print(f"Verdict:      {report['verdict']}")
-    print(f"Risk Score:   {report['risk_score']}/100")
-    print()
-
-    if report['context']['trusted_domain']:
-        print("ℹ️  This domain is in the trusted list and is considered safe.")
-        return
-
-    print("CONTEXT:")
-    print(f"  - DNS Resolve:    {'✓' if report['context']['dns_resolve'] else '✗'}")
-    print(f"  - Uses HTTPS:     {'✓' if report['context']['uses_https'] else '✗'}")
-    if report['context']['domain_age_days'] is not None:
-        print(f"  - Domain Age:     {report['context']['domain_age_days']} days")
-    print()
-
-    if not report['threats']:
-        print("No threats detected.")
-        return
-
-    print("DETECTED THREATS:")
-    for severity, desc, data in report['threats']:
-        print(f"  [{severity}] {desc}")
-        if data:
-            for k, v in data.items():
-                print(f"      {k}: {v}")
-    print()
-
-    sources = report['sources']
-    if sources.get('external_domains'):
-        print("External domains loaded:")
-        for d in sources['external_domains']:
-            print(f"  - {d}")
-        print()
-
-    if sources.get('form_actions'):
-        print("Form actions to external domains:")
-        for a in sources['form_actions']:
-            print(f"  - {a}")
-        print()
-
-    if sources.get('mailto_links'):
-        print("Suspicious mailto links:")
-        for m in sources['mailto_links']:
-            print(f"  - {m}")
-        print()
-
-def main():
-    if len(sys.argv) > 1:
-        url = sys.argv[1]
-    else:
-        url = input("Enter URL to check: ")
-    print(f"Analyzing: {url} ...")
-    report = analyze(url)
-    print_report(report)
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+phishing_detector.py
+
+Advanced heuristic phishing detector.
+Prompts for a website URL, fetches it, and reports:
+- Verdict (Phishing / Suspicious / Likely safe)
+- Overall risk score (0-100)
+- Detailed threats with severities and "sources" (e.g., form actions, external scripts)
+- Helpful context (WHOIS domain age, TLS certificate info, DNS/resolve status)
+
+Dependencies (requests, lxml, tldextract, python-whois, dnspython) are
+declared in requirements.txt; optional ones degrade gracefully when absent.
+"""
+
+import sys
+import collections
+import functools
+import json
+import re
+import socket
+import ssl
+import threading
+import time
+import datetime as dt
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timezone
+from urllib.parse import urlparse, urljoin
+
+import requests
+import tldextract
+import lxml.html as lxml_html
+
+# Optional: replicated DNS lookups; the stdlib socket resolver is the
+# fallback when dnspython is not installed.
+try:
+    import dns.resolver as dns_resolver
+except ImportError:
+    dns_resolver = None
+
+# python-whois is the slowest import here and trusted-path scans never need
+# it, so defer it to first use; WHOIS context is skipped when it is absent.
+_whois_module_cache = None
+
+def _whois_module():
+    global _whois_module_cache
+    if _whois_module_cache is None:
+        try:
+            import whois
+        except ImportError:
+            whois = False
+        _whois_module_cache = whois
+    return _whois_module_cache or None
+
+# --- constants ---
+USER_AGENT = "Mozilla/5.0 (compatible; PhishGuard/1.0; +https://localhost:5000)"
+HTTP_TIMEOUT = 12
+DNS_TIMEOUT = 6
+SSL_TIMEOUT = 8
+
+# Read at most this much of a page: the heuristics only need the document
+# head plus some body, and attacker-controlled pages can be arbitrarily
+# large. Cap applies after decompression.
+MAX_FETCH_BYTES = 512 * 1024
+
+# Public resolvers raced against the system one; a slow or dropped query on
+# any single resolver no longer stalls the whole analysis. Lower
+# DNS_REPLICA_COUNT to cap the extra query bandwidth.
+PUBLIC_DNS_RESOLVERS = ["1.1.1.1", "8.8.8.8", "9.9.9.9"]
+DNS_REPLICA_COUNT = 3
+
+# Lookup results are pure functions of host/domain, so repeat scans of the
+# same site should not pay the network round-trip again. DNS records move
+# fast (15 min), certificates rotate on the scale of hours to weeks (1 h),
+# WHOIS data barely moves at all (24 h).
+DNS_CACHE_TTL = 15 * 60
+TLS_CACHE_TTL = 60 * 60
+WHOIS_CACHE_TTL = 24 * 60 * 60
+LOOKUP_CACHE_SIZE = 4096
+
+# More specific suspicious TLDs (avoid common ones); deduplicated at source,
+# frozen because membership is checked on every scan and never mutated
+SUSPICIOUS_TLDS = frozenset("""
+accountant app bar bid biz cam cc cf click club country cricket date
+download faith fit ga gq kim link loan ltd ltda men ml mom
+online party pics press pw quest rest review ryuk science stream surf tk
+top win work xyz zip
+""".split())
+
+# LEGITIMATE TLDs that should never be flagged as suspicious
+LEGITIMATE_TLDS = frozenset("""
+com org net edu gov mil io ai co uk us ca au nz de fr es it nl se no dk fi
+ie at ch be lu pt gr hu pl cz sk si hr ba rs me al mk mt cy li is ee lv lt
+""".split())
+
+# Trusted domains that should never be flagged (including subdomains)
+TRUSTED_DOMAINS = frozenset("""
+google.com facebook.com apple.com microsoft.com amazon.com netflix.com
+twitter.com instagram.com linkedin.com github.com oracle.com whatsapp.com
+signal.org telegram.org discord.com slack.com dropbox.com box.com
+adobe.com salesforce.com ibm.com intel.com nvidia.com amd.com
+paypal.com stripe.com visa.com mastercard.com americanexpress.com
+wikipedia.org mozilla.org wordpress.org archive.org
+berkeley.edu stanford.edu mit.edu harvard.edu yale.edu princeton.edu
+columbia.edu upenn.edu cornell.edu brown.edu dartmouth.edu
+ucla.edu ucsd.edu ucb.edu umich.edu uiuc.edu utexas.edu
+""".split())
+
+# Trusted suffixes: a domain under any of these is trusted at any depth.
+# Bare entries ("edu") match the whole TLD; "edu.*" style entries match the
+# family under any country code (edu.au, edu.uk, ac.jp, ...).
+TRUSTED_TLDS = ["edu", "gov", "org", "mil"]
+TRUSTED_CC_SECOND_LEVELS = ["edu", "gov", "ac"]
+
+# Reverse-label trie built once at import: domain labels are reversed so the
+# TLD is the root, and the sentinel key marks "this domain and all of its
+# subdomains are trusted". Membership checks walk one node per label instead
+# of scanning the whole trusted list with endswith/regex per candidate.
+_TRIE_END = None
+_TRIE_WILDCARD = "*"
+
+def _build_trusted_trie():
+    trie = {}
+
+    def insert(labels):
+        node = trie
+        for label in labels:
+            node = node.setdefault(label, {})
+        node[_TRIE_END] = True
+
+    for entry in TRUSTED_DOMAINS:
+        insert(reversed(entry.split(".")))
+    for tld in TRUSTED_TLDS:
+        insert([tld])
+    for second in TRUSTED_CC_SECOND_LEVELS:
+        insert([_TRIE_WILDCARD, second])
+    return trie
+
+TRUSTED_TRIE = _build_trusted_trie()
+
+# Matched against the raw input before any URL parsing: a hit on the
+# whitelist union means the trusted report can be returned without paying
+# for urlparse/tldextract at all.
+_TRUSTED_FAST_RE = re.compile(
+    r"^(?:(https?)://)?((?:[a-z0-9-]+\.)*("
+    + "|".join(re.escape(d) for d in sorted(TRUSTED_DOMAINS))
+    + r"))(?::\d+)?(?:[/?#]|$)")
+
+# Reduced list of suspicious keywords - focused on phishing-specific terms
+SUSPICIOUS_KEYWORDS = [
+    "login-secure", "verify-account", "update-details", "secure-account", "bank-login", 
+    "wallet-access", "pay-now", "password-reset", "support-ticket", "helpdesk-verify",
+    "unlock-account", "billing-update", "confirm-details", "re-activate-now", 
+    "gift-card", "free-offer", "prize-winner", "bonus-claim"
+]
+
+# Optional Aho-Corasick automaton for the keyword scan: one linear pass over
+# the URL regardless of how many keywords are listed. Falls back to the
+# plain substring loop when pyahocorasick is not installed.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional NumPy for batch mode: per-character counting over many URLs runs
+# as vectorized C instead of an interpreter loop per URL.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if ahocorasick is not None:
+    _SUSPICIOUS_KW_AC = ahocorasick.Automaton()
+    for _kw in SUSPICIOUS_KEYWORDS:
+        _SUSPICIOUS_KW_AC.add_word(_kw, _kw)
+    _SUSPICIOUS_KW_AC.make_automaton()
+else:
+    _SUSPICIOUS_KW_AC = None
+
+def _first_suspicious_keyword(url_low: str):
+    if _SUSPICIOUS_KW_AC is not None:
+        hit = next(_SUSPICIOUS_KW_AC.iter(url_low), None)
+        return hit[1] if hit else None
+    for kw in SUSPICIOUS_KEYWORDS:
+        if kw in url_low:
+            return kw
+    return None
+
+_UrlFeatures = collections.namedtuple(
+    "_UrlFeatures", "length dots labels hyphens has_at double_slash keyword")
+
+def _url_features(normalized: str, host: str) -> _UrlFeatures:
+    """
+    Compute the cheap lexical URL features up front: one pass over the host
+    for the character counts (instead of separate count/split scans) and a
+    single multi-keyword search over the URL.
+    """
+    dots = hyphens = labels = run = 0
+    for c in host:
+        if c == ".":
+            dots += 1
+            if run:
+                labels += 1
+            run = 0
+        else:
+            run += 1
+            if c == "-":
+                hyphens += 1
+    if run:
+        labels += 1
+
+    has_at = "@" in normalized
+    tail = normalized.split("://", 1)[1] if "://" in normalized else normalized
+    double_slash = "//" in tail
+    keyword = _first_suspicious_keyword(normalized.lower())
+    return _UrlFeatures(len(normalized), dots, labels, hyphens, has_at, double_slash, keyword)
+
+def _url_features_batch(normalized_urls, hosts):
+    """
+    Vectorized _url_features over many URLs: the character counts run as
+    NumPy C loops over the whole batch. Keyword identity is resolved in
+    Python only for the URLs the vectorized scan actually flagged.
+    """
+    h = np.array(hosts, dtype=str)
+    n = np.array(normalized_urls, dtype=str)
+    low = np.char.lower(n)
+    dots = np.char.count(h, ".")
+    hyphens = np.char.count(h, "-")
+    lengths = np.char.str_len(n)
+    has_at = np.char.count(n, "@") > 0
+    double_slash = np.char.count(n, "//") > 1  # the first "//" is the scheme's
+    kw_flag = np.zeros(len(normalized_urls), dtype=bool)
+    for kw in SUSPICIOUS_KEYWORDS:
+        kw_flag |= np.char.find(low, kw) >= 0
+
+    feats = []
+    for i, norm in enumerate(normalized_urls):
+        keyword = _first_suspicious_keyword(norm.lower()) if kw_flag[i] else None
+        # Count non-empty labels exactly like the scalar path: hosts such
+        # as "example.com." (trailing dot survives urlparse) or "a..b.com"
+        # would be over-counted by dots + 1
+        labels = sum(1 for part in hosts[i].split(".") if part)
+        feats.append(_UrlFeatures(int(lengths[i]), int(dots[i]), labels,
+                                  int(hyphens[i]), bool(has_at[i]),
+                                  bool(double_slash[i]), keyword))
+    return feats
+
+BRAND_HINTS = ["Apple", "Microsoft", "Google", "Facebook", "Instagram", "Amazon", "Netflix", "PayPal", "Adobe", "LinkedIn", "Bank"]
+
+# Brand matcher for page titles: one Aho-Corasick pass instead of a
+# substring search per brand, same optional-dependency fallback as the
+# suspicious-keyword automaton.
+_BRAND_HINTS_LOW = tuple(b.lower() for b in BRAND_HINTS)
+
+if ahocorasick is not None:
+    _BRAND_AC = ahocorasick.Automaton()
+    for _brand in _BRAND_HINTS_LOW:
+        _BRAND_AC.add_word(_brand, _brand)
+    _BRAND_AC.make_automaton()
+else:
+    _BRAND_AC = None
+
+def _brands_in(text_low: str):
+    if _BRAND_AC is not None:
+        return {value for _, value in _BRAND_AC.iter(text_low)}
+    return {b for b in _BRAND_HINTS_LOW if b in text_low}
+
+OBFUSCATION_HINTS = [
+    r"\beval\s*\(", r"Function\s*\(", r"atob\s*\(", r"unescape\s*\(", r"fromCharCode\s*\(",
+    r"document\.write\s*\(", r"\.replace\s*\(/.*?/", r"obfuscate", r"packer", r"window\["
+]
+
+REDIRECT_HINTS = [
+    r"window\.location", r"location\.href", r"location\.replace", r"top\.location"
+]
+
+RIGHTCLICK_BLOCK_HINTS = [
+    r"contextmenu", r"document\.oncontextmenu", r"return\s+false;"
+]
+
+# The third-party "regex" module is a drop-in re replacement with a faster
+# matcher; the hint patterns are module constants matched against every
+# script on every scanned page, exactly the reuse-heavy case where a better
+# engine pays off. Purely optional - stdlib re is the fallback.
+try:
+    import regex as _re_engine
+except ImportError:
+    _re_engine = re
+
+def _fuse_hints(hints):
+    """Join a hint list into one compiled alternation so each script body is
+    scanned once per category instead of once per hint."""
+    return _re_engine.compile("(?:" + ")|(?:".join(hints) + ")", _re_engine.IGNORECASE)
+
+OBFUSCATION_RE = _fuse_hints(OBFUSCATION_HINTS)
+REDIRECT_RE = _fuse_hints(REDIRECT_HINTS)
+RIGHTCLICK_BLOCK_RE = _fuse_hints(RIGHTCLICK_BLOCK_HINTS)
+
+# Adjusted weights for risk scoring (0-100 total typical) - FIXED WEIGHTS.
+# Flat module constants rather than a dict: the scoring path reads ~25 of
+# these per URL and a global load is cheaper than a dict lookup each time.
+W_IP_IN_URL = 8
+W_PUNYCODE = 5
+W_UNICODE_HOMOGLYPHS = 5
+W_TOO_MANY_SUBDOMAINS = 2
+W_SUSPICIOUS_TLD = 4
+W_URL_LENGTH = 2
+W_AT_SYMBOL = 5
+W_DOUBLE_SLASH = 2
+W_MANY_HYPHENS = 2
+W_SUSPICIOUS_KEYWORDS = 3
+
+W_NO_HTTPS = 0  # Reduced from 15
+W_WEAK_TLS = 0
+W_CERT_SHORT_VALIDITY = 0
+W_CERT_EXPIRING_SOON = 0
+
+W_DNS_MISSING = 6
+W_DOMAIN_TOO_NEW = 4  # Reduced from 5
+W_EXTERNAL_FAVICON = 2
+W_EXTERNAL_FORM_ACTION = 8
+W_MAILTO_EXFIL = 5
+W_PASSWORD_OVER_HTTP = 10
+W_MANY_EXTERNAL_SCRIPTS = 3
+W_MANY_IFRAMES = 2
+W_OBFUSCATION = 4
+W_REDIRECT_JS = 2
+W_RIGHTCLICK_BLOCK = 2
+W_BRAND_TITLE_MISMATCH = 3
+
+def _ttl_cache(ttl: float, maxsize: int = LOOKUP_CACHE_SIZE):
+    """
+    Small thread-safe memoizer with expiry, for lookups where lru_cache's
+    cache-forever semantics would serve stale data. Successful and failed
+    (None) results are cached alike so hits and misses keep the same shape.
+    """
+    def decorator(fn):
+        cache = {}
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(args)
+                if hit is not None and now - hit[1] < ttl:
+                    return hit[0]
+            value = fn(*args)
+            with lock:
+                if len(cache) >= maxsize:
+                    cache.pop(next(iter(cache)))
+                cache[args] = (value, now)
+            return value
+        return wrapper
+    return decorator
+
+@functools.lru_cache(maxsize=4096)
+def normalize_url(url: str) -> str:
+    url = url.strip()
+    # plain prefix test; the regex engine is overkill for this check
+    if not url[:8].lower().startswith(("http://", "https://")):
+        url = "http://" + url
+    parsed = urlparse(url)
+    cleaned = parsed._replace(fragment="").geturl()
+    return cleaned
+
+# Single extractor instance pinned to the bundled public-suffix snapshot, so
+# no PSL download or cache-file I/O ever happens on the lookup path.
+_TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=())
+
+@functools.lru_cache(maxsize=8192)
+def _extract_cached(url: str):
+    """Memoized suffix split: (domain, subdomain, suffix), all lowercased.
+
+    domain_parts() runs for every script/iframe/link/form on a page, and
+    pages repeat the same handful of resource hosts; caching turns the
+    repeat PSL lookups into dict hits.
+    """
+    ext = _TLD_EXTRACT(url)
+    domain = f"{ext.domain}.{ext.suffix}" if ext.suffix else ext.domain
+    subdomain = ext.subdomain.lower() if ext.subdomain else ""
+    return domain.lower(), subdomain, (ext.suffix or "").lower()
+
+@functools.lru_cache(maxsize=4096)
+def domain_parts(url: str):
+    domain, subdomain, _ = _extract_cached(url)
+    return domain, subdomain
+
+def is_trusted_domain(domain: str):
+    """Check if domain (or any parent of it) is in the trusted trie."""
+    node = TRUSTED_TRIE
+    for label in reversed(domain.lower().split(".")):
+        child = node.get(label) or node.get(_TRIE_WILDCARD)
+        if child is None:
+            return False
+        if _TRIE_END in child:
+            return True
+        node = child
+    return False
+
+def is_trusted_url(url: str) -> bool:
+    """
+    Whole-URL trusted check for callers holding a raw input: the whitelist
+    fast-path regex first (no parsing at all), then the trie walk on the
+    parsed registered domain for the TLD families the regex doesn't cover.
+    """
+    if _TRUSTED_FAST_RE.match(url.strip().lower()):
+        return True
+    domain, _ = domain_parts(url)
+    return is_trusted_domain(domain)
+
+def is_legitimate_tld(tld: str):
+    return tld in LEGITIMATE_TLDS
+
+def is_ip(host: str) -> bool:
+    try:
+        socket.inet_aton(host)
+        return True
+    except OSError:
+        pass
+    try:
+        socket.inet_pton(socket.AF_INET6, host)
+        return True
+    except OSError:
+        return False
+
+def contains_unicode_homoglyphs(host: str) -> bool:
+    return any(ord(c) > 127 for c in host)
+
+@_ttl_cache(DNS_CACHE_TTL)
+def get_dns_a(host: str):
+    try:
+        socket.setdefaulttimeout(DNS_TIMEOUT)
+        return socket.gethostbyname_ex(host)
+    except Exception:
+        return None
+
+@_ttl_cache(DNS_CACHE_TTL)
+def get_dns_a_replicated(host: str):
+    """
+    Replicate the A lookup to the system resolver plus a few public ones and
+    return the first successful answer (same shape as gethostbyname_ex).
+    Falls back to get_dns_a if dnspython is unavailable or every replicated
+    query errors.
+    """
+    if dns_resolver is None:
+        return get_dns_a(host)
+
+    def _query(nameserver):
+        resolver = dns_resolver.Resolver()
+        if nameserver:
+            resolver.nameservers = [nameserver]
+        resolver.timeout = DNS_TIMEOUT
+        resolver.lifetime = DNS_TIMEOUT
+        answer = resolver.resolve(host, "A")
+        return (host, [], [rr.address for rr in answer])
+
+    targets = [None] + PUBLIC_DNS_RESOLVERS[:DNS_REPLICA_COUNT]
+    pool = ThreadPoolExecutor(max_workers=len(targets))
+    try:
+        pending = {pool.submit(_query, t) for t in targets}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if not future.exception():
+                    return future.result()
+    except Exception:
+        pass
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return get_dns_a(host)
+
+def get_tls_cert(host: str, port: int = 443):
+    try:
+        context = ssl.create_default_context()
+        with socket.create_connection((host, port), timeout=SSL_TIMEOUT) as sock:
+            with context.wrap_socket(sock, server_hostname=host) as ssock:
+                cert = ssock.getpeercert()
+                return cert
+    except Exception:
+        return None
+
+@_ttl_cache(TLS_CACHE_TTL)
+def _get_tls_cert_cached(host: str, port: int = 443):
+    return get_tls_cert(host, port)
+
+def parse_cert_dates(cert):
+    def _parse(s):
+        try:
+            return dt.datetime.strptime(s, "%b %d %H:%M:%S %Y %Z").replace(tzinfo=timezone.utc)
+        except Exception:
+            return None
+    not_before = _parse(cert.get("notBefore", "")) if cert else None
+    not_after = _parse(cert.get("notAfter", "")) if cert else None
+    return not_before, not_after
+
+def _flatten_cert_name(name_obj):
+    """
+    ssl.getpeercert()['subject'] / ['issuer'] look like:
+      ((('commonName','example.com'),), (('organizationName',"Let's Encrypt"),), ...)
+    Convert robustly to a flat dict.
+    """
+    if not name_obj:
+        return {}
+    try:
+        # ssl.getpeercert() reliably yields tuples of (key, value) pairs, so
+        # take the fast comprehension path and keep the old best-effort
+        # stringify only as the malformed-input fallback.
+        return {str(kv[0]): str(kv[1]) for rdn in name_obj for kv in rdn if len(kv) == 2}
+    except Exception:
+        try:
+            return {"raw": str(name_obj)}
+        except Exception:
+            return {}
+
+@_ttl_cache(WHOIS_CACHE_TTL)
+def get_whois(domain: str):
+    mod = _whois_module()
+    if mod is None:
+        return None
+    try:
+        data = mod.whois(domain)
+        return data
+    except Exception:
+        return None
+
+def domain_age_days(w):
+    def _to_dt(x):
+        if isinstance(x, list):
+            x = x[0]
+        if isinstance(x, dt.datetime):
+            return x
+        try:
+            return dt.datetime.fromisoformat(str(x))
+        except Exception:
+            return None
+    if not w:
+        return None
+    created = _to_dt(getattr(w, "creation_date", None))
+    if not created:
+        return None
+    if not created.tzinfo:
+        created = created.replace(tzinfo=timezone.utc)
+    now = dt.datetime.now(timezone.utc)
+    return max(0, (now - created).days)
+
+# Peer certificates observed while fetching: the page fetch already
+# completes a TLS handshake with the host, which yields the same cert
+# get_tls_cert() would otherwise open a second connection for. Entries
+# expire like the dedicated cert cache and the dict is bounded the same
+# way as the other lookup caches.
+_PEER_CERTS = {}
+
+class _CertCapturingAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter that records the server certificate as a fetch side-effect."""
+
+    def build_response(self, req, resp):
+        try:
+            sock = resp.connection.sock
+            if sock is not None:
+                host = urlparse(req.url).hostname
+                if host:
+                    if len(_PEER_CERTS) >= LOOKUP_CACHE_SIZE:
+                        _PEER_CERTS.pop(next(iter(_PEER_CERTS)))
+                    _PEER_CERTS[host] = (sock.getpeercert(), time.monotonic())
+        except Exception:
+            pass
+        return super().build_response(req, resp)
+
+def get_last_cert(host: str):
+    """Certificate captured by a recent HTTPS fetch of host, if any."""
+    hit = _PEER_CERTS.get(host)
+    if hit is None or time.monotonic() - hit[1] >= TLS_CACHE_TTL:
+        return None
+    return hit[0]
+
+# One shared session: the HTTPS-upgrade retry and concurrent analyses reuse
+# pooled TCP+TLS connections instead of paying a fresh handshake per fetch.
+SESSION = requests.Session()
+_http_adapter = _CertCapturingAdapter(pool_connections=16, pool_maxsize=32)
+SESSION.mount("http://", _http_adapter)
+SESSION.mount("https://", _http_adapter)
+
+# Lightweight stand-in for the requests Response: just the two fields the
+# analyzer reads, holding a size-capped body instead of the full download.
+FetchResult = collections.namedtuple("FetchResult", "status_code content")
+
+def fetch(url: str):
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Accept": "*/*",
+        "Accept-Encoding": "gzip, deflate",
+    }
+    try:
+        resp = SESSION.get(url, headers=headers, timeout=HTTP_TIMEOUT,
+                           allow_redirects=True, stream=True)
+        try:
+            body = resp.raw.read(MAX_FETCH_BYTES, decode_content=True)
+        finally:
+            resp.close()
+        return FetchResult(resp.status_code, body)
+    except Exception:
+        return None
+
+def try_https_upgrade(url: str):
+    parsed = urlparse(url)
+    if parsed.scheme == "http":
+        return url.replace("http://", "https://", 1)
+    return url
+
+def _sweep_html(tree, base_domain: str):
+    """
+    Walk the parsed document exactly once, bucketing everything analyze()
+    needs (title, favicon, forms, mailto links, password inputs, iframes,
+    external resource domains, inline script bodies) instead of running a
+    full find_all traversal per category.
+    """
+    page = {
+        "title": None,
+        "favicon_href": None,
+        "form_actions": [],
+        "mailto_links": [],
+        "password_fields": 0,
+        "iframe_count": 0,
+        "external_domains": set(),
+        "scripts": [],
+    }
+
+    def _note_external(url):
+        d, _ = domain_parts(url)
+        if d and d != base_domain:
+            page["external_domains"].add(d)
+
+    for elem in tree.iter():
+        tag = elem.tag
+        if tag == "script":
+            src = elem.get("src")
+            if src:
+                _note_external(src)
+            else:
+                content = (elem.text or "").strip()
+                if content:
+                    page["scripts"].append(content)
+        elif tag == "iframe":
+            page["iframe_count"] += 1
+            src = elem.get("src")
+            if src:
+                _note_external(src)
+        elif tag == "link":
+            href = elem.get("href")
+            if href:
+                _note_external(href)
+                if page["favicon_href"] is None:
+                    # lxml attribute values are plain strings, so no need
+                    # for the old list/tuple-tolerant rel predicate
+                    rel = elem.get("rel")
+                    if rel and "icon" in rel.lower():
+                        page["favicon_href"] = href
+        elif tag == "form":
+            action = elem.get("action")
+            if action:
+                page["form_actions"].append(action)
+        elif tag == "a":
+            href = elem.get("href")
+            if href and href.startswith("mailto:") and "?" in href:
+                page["mailto_links"].append(href)
+        elif tag == "input":
+            if (elem.get("type") or "").lower() == "password":
+                page["password_fields"] += 1
+        elif tag == "title":
+            if page["title"] is None:
+                page["title"] = elem.text
+    return page
+
+def looks_like_brand_mismatch(title: str, domain: str):
+    title_low = (title or "").strip().lower()
+    if not title_low:
+        return False
+    title_brands = _brands_in(title_low)
+    if not title_brands:
+        return False
+    domain_low = domain.lower()
+    return not any(b in domain_low for b in title_brands)
+
+def _trusted_report(input_url: str, normalized: str, host: str, domain: str, uses_https: bool):
+    """Constant-shape safe report for whitelisted domains; no network work."""
+    return {
+        "input_url": input_url,
+        "normalized_url": normalized,
+        "host": host,
+        "domain": domain,
+        "tld": domain.split('.')[-1],
+        "verdict": "Likely safe",
+        "risk_score": 0,
+        "threats": [],
+        "context": {
+            "dns_resolve": True,
+            "domain_age_days": None,
+            "uses_https": uses_https,
+            "trusted_domain": True
+        },
+        "sources": {}
+    }
+
+def analyze(url: str, url_feats: _UrlFeatures = None):
+    findings = []
+    score = 0
+
+    # Fast path: whole-host match on the raw input against the trusted
+    # whitelist, before any parsing.
+    m = _TRUSTED_FAST_RE.match(url.strip().lower())
+    if m:
+        scheme, fast_host, fast_domain = m.group(1), m.group(2), m.group(3)
+        return _trusted_report(url, normalize_url(url), fast_host, fast_domain,
+                               scheme == "https")
+
+    normalized = normalize_url(url)
+    parsed = urlparse(normalized)
+    host = parsed.hostname or ""
+    domain, subdomain = domain_parts(normalized)
+
+    # Check if this is a trusted domain - if so, return safe immediately
+    if is_trusted_domain(domain):
+        return _trusted_report(url, normalized, host, domain,
+                               parsed.scheme.lower() == "https")
+
+    # Kick off every network lookup at once: DNS, WHOIS, and the page fetch
+    # are all I/O-bound and spend nearly all their time waiting, so running
+    # them concurrently costs the max of the round-trips instead of the
+    # sum. (TLS comes for free from the fetch handshake, see below.) The
+    # with-block waits for all of them, so the .result() calls never block.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        f_dns = pool.submit(get_dns_a_replicated, host)
+        f_whois = pool.submit(get_whois, domain)
+        f_resp = pool.submit(fetch, normalized)
+
+    # --- URL-based checks ---
+    feats = url_feats or _url_features(normalized, host)
+    sub_count = feats.labels - 2 if domain in host else feats.dots
+    _, _, suffix = _extract_cached(normalized)
+    tld = suffix.split(".")[-1]
+
+    # One flat (flag, weight, severity, message, data) table: the findings
+    # and score fall out of a single loop instead of ~10 branch bodies each
+    # doing its own WEIGHTS lookup.
+    url_checks = (
+        (is_ip(host), W_IP_IN_URL, "MEDIUM",
+         "IP address used in URL (often used to hide identity).", {"host": host}),
+        (host.startswith("xn--") or ".xn--" in host, W_PUNYCODE, "LOW",
+         "Punycode (IDN) in hostname; potential homograph attack.", {"host": host}),
+        (contains_unicode_homoglyphs(host), W_UNICODE_HOMOGLYPHS, "LOW",
+         "Non-ASCII characters in hostname; possible IDN homograph attempt.", {"host": host}),
+        # Increased threshold from 5 to 6
+        (sub_count >= 6, W_TOO_MANY_SUBDOMAINS, "LOW",
+         f"Many subdomains ({sub_count}).", {"host": host}),
+        # Only flag TLD if it's suspicious AND not legitimate
+        (tld in SUSPICIOUS_TLDS and not is_legitimate_tld(tld), W_SUSPICIOUS_TLD, "LOW",
+         f"Suspicious TLD: .{tld}", {"tld": tld}),
+        # Increased threshold from 150 to 180
+        (feats.length > 180, W_URL_LENGTH, "LOW",
+         f"Long URL ({feats.length} chars).", {"url": normalized[:100] + "..."}),
+        (feats.has_at, W_AT_SYMBOL, "MEDIUM",
+         "Contains '@' in URL (userinfo part).", {}),
+        (feats.double_slash, W_DOUBLE_SLASH, "LOW",
+         "Double slash in path (can be used for obfuscation).", {}),
+        # Increased threshold from 3 to 4
+        (feats.hyphens >= 4, W_MANY_HYPHENS, "LOW",
+         "Many hyphens in hostname.", {"host": host}),
+        (bool(feats.keyword), W_SUSPICIOUS_KEYWORDS, "LOW",
+         f"Suspicious keyword in URL: '{feats.keyword}'.", {"keyword": feats.keyword}),
+    )
+    for flagged, weight, severity, message, data in url_checks:
+        if flagged:
+            findings.append((severity, message, data))
+            score += weight
+
+    # --- DNS & TLS ---
+    dns = f_dns.result()
+    if not dns:
+        findings.append(("HIGH", "DNS resolution failed (domain may not exist).", {}))
+        score += W_DNS_MISSING
+    else:
+        # Check for brand mismatch in resolved hostnames
+        resolved_hosts = dns[2]
+        for resolved_host in resolved_hosts:
+            if is_ip(resolved_host):
+                continue
+            resolved_domain, _ = domain_parts(resolved_host)
+            if resolved_domain != domain:
+                findings.append(("MEDIUM", f"Resolved host '{resolved_host}' doesn't match domain '{domain}'.", {}))
+                score += 3  # Small penalty for mismatch
+
+    uses_https = parsed.scheme.lower() == "https"
+    if not uses_https:
+        findings.append(("HIGH", "No HTTPS (plain HTTP).", {}))
+        score += W_NO_HTTPS
+    else:
+        # The fetch submitted above has already finished its TLS handshake
+        # by the time the pool block exits; reuse the certificate the
+        # adapter captured and only open a dedicated connection when the
+        # fetch recorded nothing (e.g. it failed outright).
+        cert = get_last_cert(host) or _get_tls_cert_cached(host)
+        if not cert:
+            findings.append(("HIGH", "HTTPS certificate invalid or untrusted.", {}))
+            score += W_WEAK_TLS
+        else:
+            not_before, not_after = parse_cert_dates(cert)
+            if not_before and not_after:
+                now = dt.datetime.now(timezone.utc)
+                total_days = (not_after - not_before).days
+                if total_days < 30:
+                    findings.append(("LOW", f"Certificate has short validity ({total_days} days).", {}))
+                    score += W_CERT_SHORT_VALIDITY
+                if (not_after - now).days < 7:
+                    findings.append(("MEDIUM", "Certificate expiring soon.", {}))
+                    score += W_CERT_EXPIRING_SOON
+
+    # --- WHOIS ---
+    whois_data = f_whois.result()
+    age_days = domain_age_days(whois_data)
+    if age_days is not None and age_days < 30:  # Increased threshold from 15 to 30 days
+        findings.append(("MEDIUM", f"Domain is new ({age_days} days old).", {"age_days": age_days}))
+        score += W_DOMAIN_TOO_NEW
+
+    # --- HTML content analysis ---
+    resp = f_resp.result()
+    if not resp:
+        # If HTTP fails, try HTTPS upgrade
+        https_url = try_https_upgrade(normalized)
+        if https_url != normalized:
+            resp = fetch(https_url)
+            if resp:
+                normalized = https_url
+                parsed = urlparse(normalized)
+                uses_https = True
+
+    sources = {
+        "external_domains": [],
+        "form_actions": [],
+        "mailto_links": [],
+        "obfuscated_scripts": [],
+        "redirect_scripts": [],
+        "rightclick_block": False,
+        "title": None,
+        "favicon_external": False
+    }
+
+    if resp and resp.status_code == 200:
+        # lxml parses the raw bytes in C (typically 5-20x faster than
+        # html.parser) and _sweep_html buckets everything in one traversal.
+        try:
+            tree = lxml_html.fromstring(resp.content)
+        except Exception:
+            tree = None
+
+        if tree is not None:
+            page = _sweep_html(tree, domain)
+            sources["title"] = page["title"]
+
+            # Check for brand mismatch in title
+            if sources["title"] and looks_like_brand_mismatch(sources["title"], domain):
+                findings.append(("MEDIUM", "Title contains brand name not matching domain.", {"title": sources["title"]}))
+                score += W_BRAND_TITLE_MISMATCH
+
+            # Favicon
+            if page["favicon_href"]:
+                favicon_domain, _ = domain_parts(page["favicon_href"])
+                if favicon_domain and favicon_domain != domain:
+                    findings.append(("LOW", "Favicon loaded from external domain.", {"external_domain": favicon_domain}))
+                    score += W_EXTERNAL_FAVICON
+                    sources["favicon_external"] = True
+
+            # Forms
+            for action in page["form_actions"]:
+                action_domain, _ = domain_parts(action)
+                if action_domain and action_domain != domain:
+                    findings.append(("HIGH", f"Form submits to external domain: {action_domain}", {"action": action}))
+                    score += W_EXTERNAL_FORM_ACTION
+                    sources["form_actions"].append(action)
+
+            # Mailto links for potential exfiltration
+            for href in page["mailto_links"]:
+                findings.append(("MEDIUM", "Mailto link with parameters (potential data exfiltration).", {"href": href}))
+                score += W_MAILTO_EXFIL
+                sources["mailto_links"].append(href)
+
+            # Password fields over HTTP
+            if not uses_https and page["password_fields"]:
+                findings.append(("HIGH", "Password field(s) found on HTTP page.", {"count": page["password_fields"]}))
+                score += W_PASSWORD_OVER_HTTP
+
+            # External scripts and iframes
+            externals = page["external_domains"]
+            sources["external_domains"] = list(externals)
+            if len(externals) > 8:  # Increased threshold from 5 to 8
+                findings.append(("LOW", f"Many external domains loaded ({len(externals)}).", {"domains": list(externals)}))
+                score += W_MANY_EXTERNAL_SCRIPTS
+
+            if page["iframe_count"] > 5:  # Increased threshold from 3 to 5
+                findings.append(("LOW", f"Many iframes ({page['iframe_count']}).", {}))
+                score += W_MANY_IFRAMES
+
+            # Script content analysis
+            for content in page["scripts"]:
+                # Obfuscation
+                if OBFUSCATION_RE.search(content):
+                    findings.append(("MEDIUM", "Script contains obfuscation patterns.", {}))
+                    score += W_OBFUSCATION
+                    sources["obfuscated_scripts"].append(content[:100] + "..." if len(content) > 100 else content)
+
+                # Redirects
+                if REDIRECT_RE.search(content):
+                    findings.append(("LOW", "Script contains redirect logic.", {}))
+                    score += W_REDIRECT_JS
+                    sources["redirect_scripts"].append(content[:100] + "..." if len(content) > 100 else content)
+
+                # Right-click block
+                if RIGHTCLICK_BLOCK_RE.search(content):
+                    findings.append(("LOW", "Script blocks right-click (common in phishing).", {}))
+                    score += W_RIGHTCLICK_BLOCK
+                    sources["rightclick_block"] = True
+
+    # --- Final scoring and verdict ---
+    # Adjusted thresholds to reduce false positives
+    if score >= 35:  # Increased from 25 to 35
+        verdict = "Phishing"
+    elif score >= 20:  # Increased from 15 to 20
+        verdict = "Suspicious"
+    else:
+        verdict = "Likely safe"
+
+    context = {
+        "dns_resolve": bool(dns),
+        "domain_age_days": age_days,
+        "uses_https": uses_https,
+        "trusted_domain": False
+    }
+
+    return {
+        "input_url": url,
+        "normalized_url": normalized,
+        "host": host,
+        "domain": domain,
+        "tld": tld,
+        "verdict": verdict,
+        "risk_score": score,
+        "threats": findings,
+        "context": context,
+        "sources": sources
+    }
+
+def analyze_batch(urls):
+    """
+    Analyze many URLs at once: the analyses (I/O-bound) always run in a
+    thread pool; when NumPy is installed the lexical features are
+    additionally precomputed for the whole batch in one vectorized pass.
+    """
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(urls))) as pool:
+        if np is None:
+            return list(pool.map(analyze, urls))
+        normalized = [normalize_url(u) for u in urls]
+        hosts = [urlparse(n).hostname or "" for n in normalized]
+        feats = _url_features_batch(normalized, hosts)
+        return list(pool.map(analyze, urls, feats))
+
+def print_report(report):
+    print("\n" + "="*60)
+    print("PHISHING DETECTION REPORT")
+    print("="*60)
+    print(f"Input URL:    {report['input_url']}")
+    print(f"Normalized:   {report['normalized_url']}")
+    print(f"Domain:       {report['domain']}")
+    print(f"TLD:          {report['tld']}")
+    print(f"Verdict:      {report['verdict']}")
+    print(f"Risk Score:   {report['risk_score']}/100")
+    print()
+
+    if report['context']['trusted_domain']:
+        print("ℹ️  This domain is in the trusted list and is considered safe.")
+        return
+
+    print("CONTEXT:")
+    print(f"  - DNS Resolve:    {'✓' if report['context']['dns_resolve'] else '✗'}")
+    print(f"  - Uses HTTPS:     {'✓' if report['context']['uses_https'] else '✗'}")
+    if report['context']['domain_age_days'] is not None:
+        print(f"  - Domain Age:     {report['context']['domain_age_days']} days")
+    print()
+
+    if not report['threats']:
+        print("No threats detected.")
+        return
+
+    print("DETECTED THREATS:")
+    for severity, desc, data in report['threats']:
+        print(f"  [{severity}] {desc}")
+        if data:
+            for k, v in data.items():
+                print(f"      {k}: {v}")
+    print()
+
+    sources = report['sources']
+    if sources.get('external_domains'):
+        print("External domains loaded:")
+        for d in sources['external_domains']:
+            print(f"  - {d}")
+        print()
+
+    if sources.get('form_actions'):
+        print("Form actions to external domains:")
+        for a in sources['form_actions']:
+            print(f"  - {a}")
+        print()
+
+    if sources.get('mailto_links'):
+        print("Suspicious mailto links:")
+        for m in sources['mailto_links']:
+            print(f"  - {m}")
+        print()
+
+def main():
+    if len(sys.argv) > 1:
+        url = sys.argv[1]
+    else:
+        url = input("Enter URL to check: ")
+    print(f"Analyzing: {url} ...")
+    report = analyze(url)
+    print_report(report)
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
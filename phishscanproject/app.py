@@ -1,301 +1,499 @@
-from flask import Flask, render_template, request, jsonify, session, Response
-import json
-from datetime import datetime
-from phishing_detector import analyze, is_trusted_domain, domain_parts
-import os
-
-# File to store scan history
-HISTORY_FILE = "phishing_history.json"
-
-# In-memory scan history
-scan_history = []
-
-def save_history():
-    """Save history to JSON file."""
-    with open(HISTORY_FILE, "w") as f:
-        json.dump(scan_history, f, indent=2)
-
-def load_history():
-    """Load history from JSON file if exists."""
-    global scan_history
-    if os.path.exists(HISTORY_FILE):
-        with open(HISTORY_FILE, "r") as f:
-            scan_history = json.load(f)
-
-# Flask app
-app = Flask(__name__)
-app.secret_key = 'phishscan-secret-key-2025'
-
-# Load history at startup
-load_history()
-
-@app.route('/')
-def landing():
-    return render_template('landing.html')
-
-@app.route('/home')
-def home():
-    return render_template('home.html')
-
-@app.route('/scanner')
-def scanner():
-    return render_template('scanner.html')
-
-@app.route('/results')
-def results():
-    return render_template('results.html')
-
-@app.route('/history')
-def history():
-    return render_template('history.html', history=scan_history)
-
-@app.route('/settings')
-def settings():
-    return render_template('settings.html')
-
-@app.route('/api/clear-history', methods=['POST'])
-def clear_history():
-    global scan_history
-    scan_history.clear()
-    save_history()
-    session.pop('total_scans', None)
-    session.pop('threats_blocked', None)
-    return jsonify({'status': 'success', 'message': 'History cleared'})
-
-@app.route('/api/stats')
-def get_stats():
-    total_scans = len(scan_history)
-    threats_blocked = sum(1 for scan in scan_history if scan.get('status') == 'dangerous')
-    
-    return jsonify({
-        'total_scans': total_scans,
-        'threats_blocked': threats_blocked
-    })
-
-# API endpoint for scanning
-@app.route('/api/scan', methods=['POST'])
-def scan_url():
-    data = request.get_json()
-    url = data.get('url', '')
-    
-    if not url:
-        return jsonify({'error': 'No URL provided'}), 400
-    
-    try:
-        # First check if this is a trusted domain before full analysis
-        domain, _ = domain_parts(url)
-        if is_trusted_domain(domain):
-            # Return safe result immediately for trusted domains
-            response_data = {
-                'status': 'safe',
-                'message': 'This is a trusted domain and appears to be safe',
-                'confidence': 0.95,
-                'features': {
-                    'domain_age': 'Trusted domain',
-                    'https': True,
-                    'suspicious_keywords': False,
-                    'dns_resolve': True,
-                    'redirects': 0
-                },
-                'shap_values': {
-                    'domain_age': 0.4,
-                    'https': 0.3,
-                    'suspicious_keywords': -0.1,
-                    'dns_resolve': 0.2,
-                    'redirects': 0.05
-                }
-            }
-            
-            # Add to history
-            scan_entry = {
-                'url': url,
-                'status': 'safe',
-                'confidence': 0.95,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            scan_history.append(scan_entry)
-            save_history()
-            
-            # Update session stats
-            session['total_scans'] = session.get('total_scans', 0) + 1
-            
-            return jsonify(response_data)
-        
-        # Use the phishing detector for non-trusted domains
-        result = analyze(url)
-        
-        # Map verdict to status safely
-        verdict = (result['verdict'] or '').strip().lower()
-
-        status_map = {
-            'phishing': 'dangerous',
-            'suspicious': 'suspicious',
-            'likely safe': 'safe'
-        }
-
-        status = status_map.get(verdict, 'safe')
-
-        confidence = min(result['risk_score'] / 100, 0.99)  # Cap at 0.99
-        
-        # Features
-        features = {
-            'domain_age': f"{result['context'].get('domain_age_days', 'Unknown')} days",
-            'https': result['context'].get('uses_https', False),
-            'suspicious_keywords': any('suspicious' in desc.lower() for (_, desc, _) in result['threats']),
-            'dns_resolve': result['context'].get('dns_resolve', False),
-            'redirects': sum(1 for (_, desc, _) in result['threats'] if 'redirect' in desc.lower())
-        }
-        
-        # SHAP values (demo version)
-        shap_values = {
-            'domain_age': 0.3 if result['context'].get('domain_age_days', 100) < 30 else -0.2,
-            'https': 0.25 if result['context'].get('uses_https') else -0.3,
-            'suspicious_keywords': 0.15 if features['suspicious_keywords'] else -0.1,
-            'dns_resolve': 0.1 if features['dns_resolve'] else -0.2,
-            'redirects': 0.05 * features['redirects']
-        }
-        
-        response_data = {
-            'status': status,
-            'message': f"This URL is {result['verdict'].lower()} with a risk score of {result['risk_score']}%",
-            'confidence': confidence,
-            'features': features,
-            'shap_values': shap_values
-        }
-        
-        # Add to history
-        scan_entry = {
-            'url': url,
-            'status': status,
-            'confidence': confidence,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        scan_history.append(scan_entry)
-        save_history()
-        
-        # Update session stats
-        session['total_scans'] = session.get('total_scans', 0) + 1
-        if status == 'dangerous':
-            session['threats_blocked'] = session.get('threats_blocked', 0) + 1
-        
-        return jsonify(response_data)
-        
-    except Exception as e:
-        print(f"Error scanning URL: {e}")
-        # Fallback mock responses
-        mock_responses = [
-            {
-                'status': 'safe',
-                'message': 'This URL appears to be safe and legitimate',
-                'confidence': 0.92,
-                'features': {
-                    'domain_age': '2 years',
-                    'https': True,
-                    'suspicious_keywords': False,
-                    'dns_resolve': True,
-                    'redirects': 0
-                },
-                'shap_values': {
-                    'domain_age': 0.35,
-                    'https': 0.28,
-                    'suspicious_keywords': -0.05,
-                    'dns_resolve': 0.15,
-                    'redirects': 0.07
-                }
-            },
-            {
-                'status': 'suspicious',
-                'message': 'This URL shows some suspicious characteristics',
-                'confidence': 0.65,
-                'features': {
-                    'domain_age': '3 days',
-                    'https': False,
-                    'suspicious_keywords': True,
-                    'dns_resolve': True,
-                    'redirects': 2
-                },
-                'shap_values': {
-                    'domain_age': -0.32,
-                    'https': -0.25,
-                    'suspicious_keywords': 0.18,
-                    'dns_resolve': 0.10,
-                    'redirects': 0.12
-                }
-            },
-            {
-                'status': 'dangerous',
-                'message': 'This URL is potentially dangerous and likely a phishing attempt',
-                'confidence': 0.98,
-                'features': {
-                    'domain_age': '1 day',
-                    'https': False,
-                    'suspicious_keywords': True,
-                    'dns_resolve': False,
-                    'redirects': 4
-                },
-                'shap_values': {
-                    'domain_age': -0.45,
-                    'https': -0.32,
-                    'suspicious_keywords': 0.38,
-                    'dns_resolve': -0.28,
-                    'redirects': 0.22
-                }
-            }
-        ]
-        
-        # Select mock response based on URL
-        if 'safe' in url:
-            response = mock_responses[0]
-        elif 'suspicious' in url:
-            response = mock_responses[1]
-        else:
-            response = mock_responses[2]
-        
-        # Add to history
-        scan_entry = {
-            'url': url,
-            'status': response['status'],
-            'confidence': response['confidence'],
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        scan_history.append(scan_entry)
-        save_history()
-        
-        # Update session stats
-        session['total_scans'] = session.get('total_scans', 0) + 1
-        if response['status'] == 'dangerous':
-            session['threats_blocked'] = session.get('threats_blocked', 0) + 1
-        
-        return jsonify(response)
-
-@app.route('/api/download/<int:index>')
-def download_report(index):
-    if index < 0 or index >= len(scan_history):
-        return jsonify({"error": "Invalid index"}), 400
-    
-    entry = scan_history[index]
-    report_text = (
-        f"PhishScan Report\n"
-        f"=================\n"
-        f"URL: {entry['url']}\n"
-        f"Status: {entry['status']}\n"
-        f"Confidence: {entry['confidence']:.2f}\n"
-        f"Timestamp: {entry['timestamp']}\n"
-    )
-    
-    return Response(
-        report_text,
-        mimetype="text/plain",
-        headers={"Content-Disposition": f"attachment;filename=phishscan_report_{index+1}.txt"}
-    )
-
-@app.route('/api/theme', methods=['POST'])
-def set_theme():
-    data = request.get_json()
-    theme = data.get('theme', 'light')
-    session['theme'] = theme
-    return jsonify({'status': 'success', 'theme': theme})
-
-if __name__ == '__main__':
-    app.run(debug=True)
+from flask import Flask, render_template, request, jsonify, session, Response
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+from phishing_detector import analyze, analyze_batch, is_trusted_url, normalize_url
+
+# orjson encodes in C and skips the sorting/indenting the stdlib provider
+# does per response; optional, the app works on the default provider too.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Scan history lives in SQLite: WAL mode allows concurrent reads during
+# writes and each scan is a single O(1) INSERT, instead of rewriting the
+# whole JSON file (O(history)) inside every request.
+HISTORY_DB = "phishing_history.db"
+
+# Pre-SQLite history file, imported once if present
+LEGACY_HISTORY_FILE = "phishing_history.json"
+
+# Checked before connect() creates the file: the legacy JSON import may
+# only run into a brand-new database. Guarding on "table is empty" would
+# resurrect entries the user explicitly cleared once the process restarts.
+_db_is_new = not os.path.exists(HISTORY_DB)
+
+_db = sqlite3.connect(HISTORY_DB, check_same_thread=False)
+_db.execute("PRAGMA journal_mode=WAL")
+_db.execute("PRAGMA synchronous=NORMAL")
+_db.execute("""
+    CREATE TABLE IF NOT EXISTS scans (
+        id INTEGER PRIMARY KEY,
+        url TEXT NOT NULL,
+        status TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        timestamp INTEGER NOT NULL
+    )
+""")
+_db.execute("CREATE INDEX IF NOT EXISTS idx_scans_status ON scans(status)")
+_db.commit()
+_db_lock = threading.Lock()
+
+# Running counters so /api/stats never scans history: seeded from the table
+# once at startup, bumped on every insert, zeroed on clear. All mutation
+# happens under _db_lock so the counters stay consistent with the rows.
+_stats = {'total_scans': 0, 'threats_blocked': 0}
+
+def _seed_stats():
+    with _db_lock:
+        total, dangerous = _db.execute(
+            "SELECT COUNT(*), COUNT(*) FILTER (WHERE status = 'dangerous') FROM scans"
+        ).fetchone()
+        _stats['total_scans'] = total
+        _stats['threats_blocked'] = dangerous
+
+def _migrate_legacy_history():
+    """One-time import of the old JSON history file into SQLite."""
+    if not _db_is_new:
+        return
+    with _db_lock:
+        try:
+            with open(LEGACY_HISTORY_FILE, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return
+        entries = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        _db.executemany(
+            "INSERT INTO scans (url, status, confidence, timestamp) VALUES (?, ?, ?, ?)",
+            [(e.get("url", ""), e.get("status", "safe"),
+              e.get("confidence", 0.0), e.get("timestamp", "")) for e in entries])
+        _db.commit()
+
+_migrate_legacy_history()
+_seed_stats()
+
+# Commit coalescing: INSERTs run immediately (every route reads through the
+# same shared connection, so rows are visible at once) but the disk-syncing
+# COMMIT is deferred to a background flusher that wakes at most once per
+# interval, merging a burst of scans into one WAL sync. Worst case on a
+# crash is losing the last interval's scans, which history can tolerate.
+_COMMIT_INTERVAL = 1.0
+_history_dirty = threading.Event()
+
+def _history_flusher():
+    while True:
+        _history_dirty.wait()
+        time.sleep(_COMMIT_INTERVAL)  # let a burst accumulate
+        with _db_lock:
+            _history_dirty.clear()
+            _db.commit()
+
+threading.Thread(target=_history_flusher, daemon=True).start()
+
+def record_scan(url, status, confidence):
+    """Append one scan to the history; the commit happens in the flusher."""
+    with _db_lock:
+        _db.execute(
+            "INSERT INTO scans (url, status, confidence, timestamp) VALUES (?, ?, ?, ?)",
+            (url, status, confidence, int(time.time())))
+        _stats['total_scans'] += 1
+        if status == 'dangerous':
+            _stats['threats_blocked'] += 1
+    _history_dirty.set()
+
+def _format_ts(ts):
+    """Render a stored timestamp for display. New rows hold epoch seconds;
+    rows written before the change (or imported from JSON) are already
+    formatted strings. Databases created while the column was declared
+    TEXT stored the epochs as digit strings, so parse those too."""
+    if isinstance(ts, str):
+        if not ts.isdigit():
+            return ts
+        ts = int(ts)
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+
+def get_history():
+    """All scans, oldest first (row order matches /api/download indexes)."""
+    with _db_lock:
+        rows = _db.execute(
+            "SELECT url, status, confidence, timestamp FROM scans ORDER BY id").fetchall()
+    return [{"url": u, "status": s, "confidence": c, "timestamp": _format_ts(t)}
+            for u, s, c, t in rows]
+
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        """Route every jsonify/json call through orjson's C encoder."""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+# Demo SHAP contributions, precomputed per boolean feature as
+# (value when true, value when false); redirects scale linearly.
+SHAP_CONTRIB = {
+    'domain_age': (0.3, -0.2),
+    'https': (0.25, -0.3),
+    'suspicious_keywords': (0.15, -0.1),
+    'dns_resolve': (0.1, -0.2),
+}
+SHAP_REDIRECT_STEP = 0.05
+
+# Every trusted-domain scan returns the same payload, so it is serialized
+# once at import and the route skips jsonify entirely.
+_TRUSTED_RESPONSE = {
+    'status': 'safe',
+    'message': 'This is a trusted domain and appears to be safe',
+    'confidence': 0.95,
+    'features': {
+        'domain_age': 'Trusted domain',
+        'https': True,
+        'suspicious_keywords': False,
+        'dns_resolve': True,
+        'redirects': 0
+    },
+    'shap_values': {
+        'domain_age': 0.4,
+        'https': 0.3,
+        'suspicious_keywords': -0.1,
+        'dns_resolve': 0.2,
+        'redirects': 0.05
+    }
+}
+if orjson is not None:
+    _TRUSTED_BODY = orjson.dumps(_TRUSTED_RESPONSE)
+else:
+    _TRUSTED_BODY = json.dumps(_TRUSTED_RESPONSE).encode()
+
+# Fallback mock responses returned when the detector raises. Built once
+# at import instead of per failed request.
+MOCK_SAFE = {
+    'status': 'safe',
+    'message': 'This URL appears to be safe and legitimate',
+    'confidence': 0.92,
+    'features': {
+        'domain_age': '2 years',
+        'https': True,
+        'suspicious_keywords': False,
+        'dns_resolve': True,
+        'redirects': 0
+    },
+    'shap_values': {
+        'domain_age': 0.35,
+        'https': 0.28,
+        'suspicious_keywords': -0.05,
+        'dns_resolve': 0.15,
+        'redirects': 0.07
+    }
+}
+MOCK_SUSPICIOUS = {
+    'status': 'suspicious',
+    'message': 'This URL shows some suspicious characteristics',
+    'confidence': 0.65,
+    'features': {
+        'domain_age': '3 days',
+        'https': False,
+        'suspicious_keywords': True,
+        'dns_resolve': True,
+        'redirects': 2
+    },
+    'shap_values': {
+        'domain_age': -0.32,
+        'https': -0.25,
+        'suspicious_keywords': 0.18,
+        'dns_resolve': 0.10,
+        'redirects': 0.12
+    }
+}
+MOCK_DANGEROUS = {
+    'status': 'dangerous',
+    'message': 'This URL is potentially dangerous and likely a phishing attempt',
+    'confidence': 0.98,
+    'features': {
+        'domain_age': '1 day',
+        'https': False,
+        'suspicious_keywords': True,
+        'dns_resolve': False,
+        'redirects': 4
+    },
+    'shap_values': {
+        'domain_age': -0.45,
+        'https': -0.32,
+        'suspicious_keywords': 0.38,
+        'dns_resolve': -0.28,
+        'redirects': 0.22
+    }
+}
+
+# Detector verdicts mapped to UI status strings. Keyed by the exact
+# strings analyze() emits, so no per-request strip()/lower() copies.
+STATUS_MAP = {
+    'Phishing': 'dangerous',
+    'Suspicious': 'suspicious',
+    'Likely safe': 'safe',
+}
+
+# Repeat scans of the same URL within the TTL reuse the previous report
+# instead of redoing the DNS/WHOIS/fetch round trips.
+_ANALYZE_CACHE = {}
+_ANALYZE_CACHE_LOCK = threading.Lock()
+_ANALYZE_CACHE_TTL = 10 * 60
+_ANALYZE_CACHE_SIZE = 4096
+
+def _analyze_cached(url):
+    """analyze() with a small TTL cache keyed on the normalized URL.
+    Scheme and host are case-insensitive and folded; path and query are
+    not, so /A and /a stay distinct entries."""
+    parts = urlsplit(normalize_url(url))
+    key = parts._replace(scheme=parts.scheme.lower(),
+                         netloc=parts.netloc.lower()).geturl()
+    now = time.monotonic()
+    with _ANALYZE_CACHE_LOCK:
+        hit = _ANALYZE_CACHE.get(key)
+        if hit is not None and now - hit[0] < _ANALYZE_CACHE_TTL:
+            return hit[1]
+    result = analyze(url)
+    with _ANALYZE_CACHE_LOCK:
+        if len(_ANALYZE_CACHE) >= _ANALYZE_CACHE_SIZE:
+            _ANALYZE_CACHE.clear()
+        _ANALYZE_CACHE[key] = (now, result)
+    return result
+
+# Flask app
+app = Flask(__name__)
+app.secret_key = 'phishscan-secret-key-2025'
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+else:
+    # at least drop key sorting and pretty-printing from the default provider
+    app.json.sort_keys = False
+    app.json.compact = True
+
+@app.route('/')
+def landing():
+    return render_template('landing.html')
+
+@app.route('/home')
+def home():
+    return render_template('home.html')
+
+@app.route('/scanner')
+def scanner():
+    return render_template('scanner.html')
+
+@app.route('/results')
+def results():
+    return render_template('results.html')
+
+@app.route('/history')
+def history():
+    return render_template('history.html', history=get_history())
+
+@app.route('/settings')
+def settings():
+    return render_template('settings.html')
+
+@app.route('/api/clear-history', methods=['POST'])
+def clear_history():
+    with _db_lock:
+        _db.execute("DELETE FROM scans")
+        _db.commit()
+        _stats['total_scans'] = 0
+        _stats['threats_blocked'] = 0
+    return jsonify({'status': 'success', 'message': 'History cleared'})
+
+@app.route('/api/stats')
+def get_stats():
+    with _db_lock:
+        stats = dict(_stats)
+    return jsonify(stats)
+
+# API endpoint for scanning. Plain sync handlers: under WSGI an async
+# view still occupies its worker for the whole request, so concurrency
+# during the slow DNS/WHOIS/HTTP waits comes from running gunicorn with
+# thread workers (e.g. --threads), not from the view itself.
+@app.route('/api/scan', methods=['POST'])
+def scan_url():
+    data = request.get_json()
+    url = data.get('url', '')
+    
+    if not url:
+        return jsonify({'error': 'No URL provided'}), 400
+    
+    try:
+        # First check if this is a trusted domain before full analysis
+        if is_trusted_url(url):
+            status, confidence = 'safe', 0.95
+            response = Response(_TRUSTED_BODY, mimetype='application/json')
+        else:
+            # Use the phishing detector for non-trusted domains
+            result = _analyze_cached(url)
+
+            # Map verdict to status safely
+            status = STATUS_MAP.get(result['verdict'], 'safe')
+
+            confidence = min(result['risk_score'] / 100, 0.99)  # Cap at 0.99
+
+            # Read the structured finding data instead of substring-matching
+            # the human-readable descriptions: the keyword/TLD findings
+            # carry those keys in their data dict, and the detector lists
+            # one redirect_scripts source per redirect finding
+            suspicious_kw = False
+            for _, _, tdata in result['threats']:
+                if 'keyword' in tdata or 'tld' in tdata:
+                    suspicious_kw = True
+                    break
+            redirects = len(result['sources'].get('redirect_scripts', ()))
+
+            ctx = result['context']
+            age_days = ctx.get('domain_age_days')
+
+            # Features
+            features = {
+                'domain_age': f"{age_days if age_days is not None else 'Unknown'} days",
+                'https': ctx.get('uses_https', False),
+                'suspicious_keywords': suspicious_kw,
+                'dns_resolve': ctx.get('dns_resolve', False),
+                'redirects': redirects
+            }
+
+            # SHAP values (demo version): table lookup per boolean feature;
+            # an unknown domain age counts as not-young
+            feature_flags = {
+                'domain_age': age_days is not None and age_days < 30,
+                'https': features['https'],
+                'suspicious_keywords': suspicious_kw,
+                'dns_resolve': features['dns_resolve'],
+            }
+            shap_values = {name: SHAP_CONTRIB[name][0 if flag else 1]
+                           for name, flag in feature_flags.items()}
+            shap_values['redirects'] = SHAP_REDIRECT_STEP * redirects
+
+            response = jsonify({
+                'status': status,
+                'message': f"This URL is {result['verdict'].lower()} with a risk score of {result['risk_score']}%",
+                'confidence': confidence,
+                'features': features,
+                'shap_values': shap_values
+            })
+
+    except Exception as e:
+        print(f"Error scanning URL: {e}")
+        # Select mock response based on URL
+        if 'safe' in url:
+            mock = MOCK_SAFE
+        elif 'suspicious' in url:
+            mock = MOCK_SUSPICIOUS
+        else:
+            mock = MOCK_DANGEROUS
+        status, confidence = mock['status'], mock['confidence']
+        response = jsonify(mock)
+
+    # Shared tail: every branch records exactly one scan; the stat
+    # counters live server-side in _stats, so no session write (and no
+    # cookie re-signing) per request
+    record_scan(url, status, confidence)
+
+    return response
+
+# Bulk scanning: one round trip instead of one request per URL. The
+# detector's analyze_batch fans the URLs out over its own thread pool,
+# so N scans share the DNS caches and HTTP connection pool in-process.
+@app.route('/api/scan/bulk', methods=['POST'])
+def scan_bulk():
+    data = request.get_json()
+    urls = data.get('urls') if data else None
+
+    if not urls or not isinstance(urls, list):
+        return jsonify({'error': 'No URLs provided'}), 400
+
+    valid = [u for u in urls if isinstance(u, str) and u.strip()]
+
+    def run_batch():
+        try:
+            return dict(zip(valid, analyze_batch(valid)))
+        except Exception:
+            # One malformed URL must not sink the whole batch: redo the
+            # list one by one so only the failing entries degrade
+            reports = {}
+            for u in valid:
+                try:
+                    reports[u] = analyze(u)
+                except Exception as e:
+                    print(f"Error scanning URL: {e}")
+                    reports[u] = None
+            return reports
+
+    reports = run_batch()
+
+    results = []
+    for item in urls:
+        result = reports.get(item) if isinstance(item, str) else None
+        if result is None:
+            results.append({
+                'url': item,
+                'status': 'error',
+                'message': 'URL could not be scanned'
+            })
+            continue
+        status = STATUS_MAP.get(result['verdict'], 'safe')
+        confidence = min(result['risk_score'] / 100, 0.99)
+        record_scan(item, status, confidence)
+        results.append({
+            'url': item,
+            'status': status,
+            'confidence': confidence,
+            'message': f"This URL is {result['verdict'].lower()} with a risk score of {result['risk_score']}%"
+        })
+
+    return jsonify({'results': results})
+
+# Static preamble of every downloaded report, encoded once at import.
+_REPORT_HEADER = b"PhishScan Report\n=================\n"
+
+@app.route('/api/download/<int:index>')
+def download_report(index):
+    with _db_lock:
+        row = _db.execute(
+            "SELECT url, status, confidence, timestamp FROM scans ORDER BY id LIMIT 1 OFFSET ?",
+            (index,)).fetchone()
+    if row is None:
+        return jsonify({"error": "Invalid index"}), 400
+
+    url, status, confidence, timestamp = row
+    body = (
+        _REPORT_HEADER,
+        f"URL: {url}\n"
+        f"Status: {status}\n"
+        f"Confidence: {confidence:.2f}\n"
+        f"Timestamp: {_format_ts(timestamp)}\n".encode(),
+    )
+
+    return Response(
+        body,
+        mimetype="text/plain",
+        direct_passthrough=True,
+        headers={"Content-Disposition": f"attachment;filename=phishscan_report_{index+1}.txt"}
+    )
+
+@app.route('/api/theme', methods=['POST'])
+def set_theme():
+    data = request.get_json()
+    theme = data.get('theme', 'light')
+    session['theme'] = theme
+    return jsonify({'status': 'success', 'theme': theme})
+
+if __name__ == '__main__':
+    # Dev convenience only; production runs under gunicorn via wsgi.py.
+    # The debug reloader forks a second process and its traceback
+    # middleware buffers every response, so keep it off by default.
+    app.run(debug=False, threaded=True)
     
\ No newline at end of file
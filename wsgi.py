@@ -1,6 +1,7 @@
 import os
-import phishscanproject.app as app
+
+from phishscanproject.app import app
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT",4000))
-    app.run(host="0.0.0.0", port=port)
\ No newline at end of file
+    port = int(os.environ.get("PORT", 4000))
+    app.run(host="0.0.0.0", port=port, threaded=True)